@@ -1,18 +1,20 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, insert
 from models import PostureRecord
-from schemas import PostureRecordCreate
-from datetime import datetime
+from typing import List
 
-def create_posture_record(db: Session, record: PostureRecordCreate):
-    db_record = PostureRecord(
-        status=record.status,
-        timestamp=record.timestamp or datetime.utcnow()
+def create_posture_records(db: Session, records: List[dict]):
+    """
+    Insert many {"status", "timestamp"} rows in a single round-trip, returning rows in input order.
+    Rows are passed through as-is; callers are responsible for validating them.
+    """
+    stmt = insert(PostureRecord).returning(
+        PostureRecord.id, PostureRecord.status, PostureRecord.timestamp,
+        sort_by_parameter_order=True
     )
-    db.add(db_record)
+    rows = db.execute(stmt, records).all()
     db.commit()
-    db.refresh(db_record)
-    return db_record
+    return rows
 
 def get_recent_records(db: Session, limit: int = 10):
     return db.query(PostureRecord).order_by(desc(PostureRecord.timestamp)).limit(limit).all()
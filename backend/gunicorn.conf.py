@@ -0,0 +1,26 @@
+# Production server: gunicorn -c gunicorn.conf.py main:app
+# Each worker has its own SQLAlchemy pool; database.py divides the DB_POOL_SIZE /
+# DB_MAX_OVERFLOW budgets by WEB_CONCURRENCY, which on_starting sets to the final
+# worker count (including -w). Changing the count at runtime (TTIN/TTOU) is not rebalanced.
+# Dashboard updates reach every worker through Redis pub/sub (websocket_manager.py).
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+# Capped by default so every worker still gets a usable share of the connection budget
+workers = int(os.getenv("WEB_CONCURRENCY", min((2 * multiprocessing.cpu_count()) + 1, 8)))
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = 5
+
+def on_starting(server):
+    # Size pools from the worker count gunicorn actually uses; must precede importing database,
+    # which workers inherit from the master already configured
+    os.environ["WEB_CONCURRENCY"] = str(server.cfg.workers)
+    # Create tables once in the master rather than racing in every worker's import of main
+    from database import engine
+    from models import Base
+    Base.metadata.create_all(bind=engine)
+    # Don't let forked workers inherit the master's pooled connection
+    engine.dispose()
+    if server.cfg.workers > 1 and not os.getenv("REDIS_URL"):
+        server.log.warning("REDIS_URL is not set; dashboards will only receive updates stored by their own worker")
@@ -1,18 +1,19 @@
 from fastapi import FastAPI, Depends, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from datetime import datetime
-import json
+import ciso8601
 import logging
+import time
+import orjson
+from redis.exceptions import RedisError
 
 from database import get_db, engine
 from models import Base
 import crud
 import schemas
 from websocket_manager import manager
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from record_batcher import batcher, RECENT_CACHE_KEY
+from redis_client import redis_connection
 
 app = FastAPI(title="PostureTrack API", version="1.0.0")
 
@@ -29,51 +30,123 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Short TTL for cached /records/recent responses (seconds)
+RECENT_CACHE_TTL = 1
+
+# In-process cache in front of Redis: limit -> (cached_at, manager generation, records)
+RECENT_LOCAL_TTL = 0.5
+RECENT_LOCAL_MAX_KEYS = 64
+_recent_cache: dict[int, tuple[float, int, list]] = {}
+
+# Statuses the pose client can report; anything else is rejected before it reaches a batch insert
+VALID_STATUSES = frozenset({"good", "ok", "bad"})
+
+# Repeats of the last stored status within this window are not stored again (seconds)
+DUPLICATE_STATUS_WINDOW = 5.0
+
+@app.on_event("startup")
+async def connect_redis():
+    redis_connection.connect()
+    manager.start_pubsub()
+
+@app.on_event("startup")
+async def start_record_batcher():
+    batcher.start()
+
+@app.on_event("shutdown")
+async def stop_record_batcher():
+    await batcher.stop()
+
+@app.on_event("shutdown")
+async def close_redis():
+    await manager.stop_pubsub()
+    await redis_connection.close()
+
 @app.get("/")
 async def root():
     return {"message": "PostureTrack API is running"}
 
 @app.get("/records/recent", response_model=list[schemas.PostureRecord])
 async def get_recent_records(limit: int = 5, db: Session = Depends(get_db)):
-    """Get recent posture records"""
-    records = crud.get_recent_records(db, limit=limit)
+    """Get recent posture records (in-process cache, then shared Redis cache, then DB)"""
+    # Local entries expire after RECENT_LOCAL_TTL or as soon as a new record reaches this worker
+    now = time.monotonic()
+    generation = manager.generation
+    cached = _recent_cache.get(limit)
+    if cached and cached[1] == generation and now - cached[0] < RECENT_LOCAL_TTL:
+        return cached[2]
+    
+    records = await load_recent_records(limit, db)
+    
+    if len(_recent_cache) >= RECENT_LOCAL_MAX_KEYS:
+        _recent_cache.clear()
+    _recent_cache[limit] = (now, generation, records)
+    return records
+
+async def load_recent_records(limit: int, db: Session):
+    """Recent records from Redis (short TTL, cleared on insert) or the database"""
+    field = str(limit)
+    if redis_connection.available:
+        try:
+            cached = await redis_connection.client.hget(RECENT_CACHE_KEY, field)
+            redis_connection.succeeded()
+            if cached:
+                return orjson.loads(cached)
+        except RedisError as e:
+            redis_connection.failed(e)
+    
+    records = [
+        schemas.PostureRecord.model_validate(record).model_dump()
+        for record in crud.get_recent_records(db, limit=limit)
+    ]
+    
+    if redis_connection.available:
+        try:
+            async with redis_connection.client.pipeline(transaction=False) as pipe:
+                pipe.hset(RECENT_CACHE_KEY, field, orjson.dumps(records))
+                pipe.expire(RECENT_CACHE_KEY, RECENT_CACHE_TTL)
+                await pipe.execute()
+        except RedisError as e:
+            redis_connection.failed(e)
     return records
 
 @app.websocket("/ws/posture")
-async def posture_websocket(websocket: WebSocket, db: Session = Depends(get_db)):
+async def posture_websocket(websocket: WebSocket):
     """WebSocket endpoint for posture updates from pose client"""
     await websocket.accept()
     logger.info("Pose client connected")
     
+    # Last stored status for this client, kept in memory to skip duplicate inserts
+    last_status = None
+    last_stored_at = 0.0
+    
     try:
         while True:
             # Receive data from pose client
-            data = await websocket.receive_text()
+            data = await websocket.receive_bytes()
             logger.info(f"Received posture data: {data}")
             
             try:
-                posture_data = json.loads(data)
+                posture_data = orjson.loads(data)
                 
-                # Create record in database
-                record_create = schemas.PostureRecordCreate(
-                    status=posture_data["status"],
-                    timestamp=datetime.fromisoformat(posture_data["timestamp"].replace("Z", "+00:00"))
-                )
-                db_record = crud.create_posture_record(db, record_create)
+                # Parse once into plain row values; no intermediate Pydantic model on this hot path
+                status = posture_data["status"]
+                if status not in VALID_STATUSES:
+                    raise ValueError(f"unknown status {status!r}")
+                timestamp = ciso8601.parse_datetime(posture_data["timestamp"])
                 
-                # Broadcast to frontend clients
-                await manager.broadcast_to_frontends({
-                    "id": db_record.id,
-                    "status": db_record.status,
-                    "timestamp": db_record.timestamp.isoformat()
-                })
+                now = time.monotonic()
+                if status == last_status and now - last_stored_at < DUPLICATE_STATUS_WINDOW:
+                    continue
                 
-                # Send acknowledgment back to pose client
-                await websocket.send_text(json.dumps({"status": "received"}))
+                # Queue record for the next bulk insert; broadcast happens after it lands
+                batcher.enqueue({"status": status, "timestamp": timestamp})
+                last_status = status
+                last_stored_at = now
                 
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
+            except (orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
                 logger.error(f"Invalid posture data format: {e}")
-                await websocket.send_text(json.dumps({"error": "Invalid data format"}))
+                await websocket.send_text(orjson.dumps({"error": "Invalid data format"}).decode())
                 
     except WebSocketDisconnect:
         logger.info("Pose client disconnected")
@@ -93,4 +166,6 @@ async def dashboard_websocket(websocket: WebSocket):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Create tables (under gunicorn the on_starting hook does this once, before workers start)
+    Base.metadata.create_all(bind=engine)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto", http="httptools", ws="websockets", log_level="info")
\ No newline at end of file
@@ -0,0 +1,9 @@
+-- Indexes for existing databases; create_all() only adds them to new tables.
+-- Run outside a transaction block (CONCURRENTLY):
+--   psql "$DATABASE_URL" -f migrations/001_posture_records_timestamp_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posture_records_timestamp_desc
+    ON posture_records (timestamp DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posture_records_timestamp_brin
+    ON posture_records USING BRIN (timestamp);
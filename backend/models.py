@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.sql import func
 from database import Base
 
@@ -9,5 +9,12 @@ class PostureRecord(Base):
     status = Column(String, nullable=False)  # "good" or "bad"
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        # Serves ORDER BY timestamp DESC LIMIT k for recent/latest lookups
+        Index("ix_posture_records_timestamp_desc", timestamp.desc()),
+        # Compact index for range scans over the append-only timestamp column
+        Index("ix_posture_records_timestamp_brin", timestamp, postgresql_using="brin"),
+    )
+    
     def __repr__(self):
         return f"<PostureRecord(id={self.id}, status='{self.status}', timestamp='{self.timestamp}')>"
\ No newline at end of file
@@ -0,0 +1,119 @@
+from typing import List, Optional
+from sqlalchemy.exc import OperationalError
+from redis.exceptions import RedisError
+import asyncio
+import logging
+
+from database import SessionLocal
+from redis_client import redis_connection
+from websocket_manager import manager
+import crud
+
+logger = logging.getLogger(__name__)
+
+# Redis hash holding cached /records/recent responses (field per limit), dropped after each insert
+RECENT_CACHE_KEY = "recent"
+
+class RecordBatcher:
+    """Buffers incoming posture records and writes them with one bulk INSERT per batch"""
+
+    def __init__(self, max_batch: int = 100, max_delay: float = 0.25):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Record batcher started")
+
+    async def stop(self):
+        """Flush everything still queued, then stop the background task"""
+        if self._task:
+            self.queue.put_nowait(None)
+            await self._task
+            self._task = None
+            logger.info("Record batcher stopped")
+
+    def enqueue(self, record: dict):
+        self.queue.put_nowait(record)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        running = True
+        while running:
+            # Block for the first record, then gather more until the batch is full or the deadline passes
+            batch = []
+            item = await self.queue.get()
+            deadline = loop.time() + self.max_delay
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            # None is the shutdown sentinel queued by stop()
+            running = item is not None
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch: List[dict]):
+        try:
+            rows = await asyncio.to_thread(self._insert, batch)
+        except Exception as e:
+            # One bad row fails the whole statement; retry row by row so the good ones still land
+            logger.warning(f"Bulk insert of {len(batch)} posture records failed, retrying individually: {e}")
+            rows = await asyncio.to_thread(self._insert_each, batch)
+        if not rows:
+            return
+
+        # Invalidate the shared recent-records cache so no worker serves it without these rows
+        if redis_connection.available:
+            try:
+                await redis_connection.client.delete(RECENT_CACHE_KEY)
+                redis_connection.succeeded()
+            except RedisError as e:
+                redis_connection.failed(e)
+
+        # Broadcast to frontend clients on every worker once the records are persisted
+        for row in rows:
+            await manager.publish({
+                "id": row.id,
+                "status": row.status,
+                "timestamp": row.timestamp.isoformat()
+            })
+
+    def _insert(self, batch: List[dict]):
+        db = SessionLocal()
+        try:
+            return crud.create_posture_records(db, batch)
+        finally:
+            db.close()
+
+    def _insert_each(self, batch: List[dict]):
+        rows = []
+        db = SessionLocal()
+        try:
+            for i, record in enumerate(batch):
+                try:
+                    rows.extend(crud.create_posture_records(db, [record]))
+                except OperationalError as e:
+                    # Database unreachable: every remaining row would fail the same way
+                    logger.error(f"Database unavailable, dropping {len(batch) - i} posture records: {e}")
+                    break
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Dropping invalid posture record {record!r}: {e}")
+        finally:
+            db.close()
+        return rows
+
+# Global batcher instance
+batcher = RecordBatcher()
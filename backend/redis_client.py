@@ -0,0 +1,68 @@
+from typing import Optional
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+import redis.asyncio as redis
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Unset disables Redis: caching falls back to the database and updates are broadcast in-process only
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Backoff bounds while Redis is unreachable (seconds)
+RETRY_MIN = 1
+RETRY_MAX = 30
+
+class RedisConnection:
+    """
+    Redis client shared by the recent-records cache and the dashboard pub/sub.
+    One outage state covers every call site, so while Redis is down callers skip it
+    until the backoff expires and the outage is logged once rather than per request.
+    """
+
+    def __init__(self):
+        self.client: Optional[redis.Redis] = None
+        self._retry_at = 0.0
+        self._delay = RETRY_MIN
+        self._outage = False
+
+    def connect(self):
+        if REDIS_URL:
+            # No client-side retries; the shared backoff decides when Redis is tried again
+            self.client = redis.from_url(REDIS_URL, socket_connect_timeout=0.5, retry=Retry(NoBackoff(), 0))
+        else:
+            logger.info("REDIS_URL not set, running without Redis")
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    @property
+    def available(self) -> bool:
+        """True if there is a client and no outage backoff is pending"""
+        return self.client is not None and time.monotonic() >= self._retry_at
+
+    def retry_in(self) -> float:
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def succeeded(self):
+        if self._outage:
+            logger.info("Redis connection restored")
+            self._outage = False
+        self._delay = RETRY_MIN
+
+    def failed(self, error: Exception):
+        # Concurrent failures inside one backoff window count once
+        if not self.available:
+            return
+        if not self._outage:
+            logger.warning(f"Redis unavailable, using the database and local broadcasts until it returns: {error}")
+            self._outage = True
+        self._retry_at = time.monotonic() + self._delay
+        self._delay = min(self._delay * 2, RETRY_MAX)
+
+# Global connection instance
+redis_connection = RedisConnection()
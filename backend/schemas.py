@@ -1,18 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
-
-class PostureRecordCreate(BaseModel):
-    status: str
-    timestamp: Optional[datetime] = None
 
 class PostureRecord(BaseModel):
     id: int
     status: str
     timestamp: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class PostureUpdate(BaseModel):
     status: str
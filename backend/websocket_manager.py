@@ -1,13 +1,25 @@
-from typing import List
+from typing import List, Optional
 from fastapi import WebSocket
-import json
+from redis.exceptions import RedisError
+import asyncio
+import contextlib
 import logging
+import orjson
+
+from redis_client import redis_connection
 
 logger = logging.getLogger(__name__)
 
+# Redis channel that relays dashboard updates between worker processes
+BROADCAST_CHANNEL = "posture_updates"
+
 class WebSocketManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self._listener: Optional[asyncio.Task] = None
+        # Bumped for every record delivered to this worker, whichever worker stored it,
+        # so per-process caches of recent records can tell they are stale
+        self.generation = 0
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -19,12 +31,54 @@ class WebSocketManager:
             self.active_connections.remove(websocket)
             logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
+    def start_pubsub(self):
+        """Relay updates published by any worker to the dashboards connected to this one"""
+        if redis_connection.client is not None:
+            self._listener = asyncio.create_task(self._listen())
+    
+    async def stop_pubsub(self):
+        if self._listener:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+    
+    async def publish(self, message: dict):
+        """Send message to dashboards on every worker via Redis, or locally if Redis is unavailable"""
+        if redis_connection.available:
+            try:
+                await redis_connection.client.publish(BROADCAST_CHANNEL, orjson.dumps(message))
+                redis_connection.succeeded()
+                return
+            except RedisError as e:
+                redis_connection.failed(e)
+        await self.broadcast_to_frontends(message)
+    
+    async def _listen(self):
+        while True:
+            # Resubscribe on the shared outage backoff, so a down Redis is logged once per worker
+            await asyncio.sleep(redis_connection.retry_in())
+            try:
+                async with redis_connection.client.pubsub() as pubsub:
+                    await pubsub.subscribe(BROADCAST_CHANNEL)
+                    redis_connection.succeeded()
+                    async for item in pubsub.listen():
+                        if item["type"] == "message":
+                            await self._send_to_frontends(item["data"].decode())
+            except RedisError as e:
+                redis_connection.failed(e)
+    
     async def broadcast_to_frontends(self, message: dict):
         """Broadcast message to frontend clients only"""
+        # Serialize once for all clients; text frames because the dashboard JSON.parses event.data
+        await self._send_to_frontends(orjson.dumps(message).decode())
+    
+    async def _send_to_frontends(self, payload: str):
+        self.generation += 1
         disconnected = []
         for connection in self.active_connections:
             try:
-                await connection.send_text(json.dumps(message))
+                await connection.send_text(payload)
             except Exception as e:
                 logger.error(f"Error broadcasting to frontend: {e}")
                 disconnected.append(connection)
@@ -1,292 +1,464 @@
 import cv2
 import mediapipe as mp
 import numpy as np
+import orjson
 import websockets
+import argparse
 import asyncio
-import json
+import concurrent.futures
 import logging
-from datetime import datetime
+import math
+import multiprocessing
+import os
+import queue
+import time
+from datetime import datetime, timezone
 from typing import Optional
+from numba import njit
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Workload knobs: run pose inference on every Nth frame, BlazePose variant (0=lite, 1=full, 2=heavy)
+INFER_EVERY = max(1, int(os.getenv("INFER_EVERY", "2")))
+MODEL_COMPLEXITY = os.getenv("MODEL_COMPLEXITY", "1")
+if MODEL_COMPLEXITY not in ("0", "1", "2"):
+    raise SystemExit(f"MODEL_COMPLEXITY must be 0 (lite), 1 (full) or 2 (heavy), got {MODEL_COMPLEXITY!r}")
+MODEL_COMPLEXITY = int(MODEL_COMPLEXITY)
+CAPTURE_FPS = 15
+# Pending posture updates between the capture loop and the sender task
+SEND_QUEUE_SIZE = 32
+# Unchanged status is re-sent only as a heartbeat (seconds)
+HEARTBEAT_INTERVAL = 10.0
+# Inference input size; BlazePose resizes internally to 256x256 anyway
+INFER_WIDTH, INFER_HEIGHT = 640, 480
+
+# PoseLandmarker model asset and inference delegate ("gpu" falls back to CPU when unavailable)
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+MODEL_VARIANTS = ('lite', 'full', 'heavy')
+POSE_MODEL_PATH = os.getenv(
+    "POSE_MODEL_PATH",
+    os.path.join(MODEL_DIR, f"pose_landmarker_{MODEL_VARIANTS[MODEL_COMPLEXITY]}.task")
+)
+POSE_DELEGATE = os.getenv("POSE_DELEGATE", "gpu").lower()
+# Optional int8-quantized model for CPU inference; when set it replaces POSE_MODEL_PATH on CPU
+POSE_CPU_MODEL_PATH = os.getenv("POSE_CPU_MODEL_PATH")
+
+# Posture status codes index STATUS_LABELS and the BGR color LUTs below
+STATUS_LABELS = ('bad', 'ok', 'good')
+STATUS_COLORS = ((0, 0, 255), (0, 255, 255), (0, 255, 0))
+STATUS_BG_COLORS = ((0, 0, 100), (0, 100, 100), (0, 100, 0))
+
+# Rows of the landmark buffer; midpoints are appended after the pose landmarks
+POSE_LANDMARK = mp.tasks.vision.PoseLandmark
+NUM_LANDMARKS = len(POSE_LANDMARK)
+SHOULDER_MID = NUM_LANDMARKS
+HIP_MID = NUM_LANDMARKS + 1
+LEFT_FINGER_MID = NUM_LANDMARKS + 2
+RIGHT_FINGER_MID = NUM_LANDMARKS + 3
+
+# Inclusive angle bands (degrees) per metric, ordered (wrist, neck, spine)
+# Wrist - STRICTER MEDICAL STANDARDS: Good 140-180, OK 110-140, Bad <110
+# Neck - VERY LENIENT: Good <=35, OK <=50, Bad >50
+# Spine - EXTREMELY LENIENT: Good 5-80, OK <90, Bad >=90
+GOOD_LO = np.array([140.0, -np.inf, 5.0])
+GOOD_HI = np.array([np.inf, 35.0, 80.0])
+OK_LO = np.array([110.0, -np.inf, -np.inf])
+OK_HI = np.array([np.inf, 50.0, np.nextafter(90.0, -np.inf)])
+
+def classify_angles(wrist_angle, neck_angle, spine_angle):
+    """
+    Classify (wrist, neck, spine) angles in one vectorized compare
+    Returns: int array of status codes (0=bad, 1=ok, 2=good)
+    """
+    angles = np.array([wrist_angle, neck_angle, spine_angle], dtype=np.float64)
+    ok = (angles >= OK_LO) & (angles <= OK_HI)
+    good = (angles >= GOOD_LO) & (angles <= GOOD_HI)
+    return ok.astype(np.intp) + good
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def compute_all_angles(pts, mids, triples, pairs, out):
+    """
+    Native angle kernel over a landmark buffer
+    - mids: (a, b) index pairs averaged into the trailing rows of pts
+    - triples: (a, b, c) vertex angles, b is the vertex (written to out first)
+    - pairs: (a, b) line angles relative to vertical, x/y only (written after)
+    """
+    base = pts.shape[0] - mids.shape[0]
+    for m in range(mids.shape[0]):
+        a, b = mids[m, 0], mids[m, 1]
+        for k in range(3):
+            pts[base + m, k] = (pts[a, k] + pts[b, k]) * 0.5
+    
+    n = triples.shape[0]
+    for i in range(n):
+        a, b, c = triples[i, 0], triples[i, 1], triples[i, 2]
+        dot = 0.0
+        norm1 = 0.0
+        norm2 = 0.0
+        for k in range(3):
+            v1 = pts[a, k] - pts[b, k]
+            v2 = pts[c, k] - pts[b, k]
+            dot += v1 * v2
+            norm1 += v1 * v1
+            norm2 += v2 * v2
+        cos_angle = dot / (math.sqrt(norm1) * math.sqrt(norm2) + 1e-6)
+        cos_angle = min(max(cos_angle, -1.0), 1.0)
+        out[i] = math.degrees(math.acos(cos_angle))
+    
+    for j in range(pairs.shape[0]):
+        a, b = pairs[j, 0], pairs[j, 1]
+        dx = pts[b, 0] - pts[a, 0]
+        dy = pts[b, 1] - pts[a, 1]
+        out[n + j] = abs(math.degrees(math.atan2(dx, dy)))
+    return out
+
+# Result reported when no pose could be analyzed
+NO_POSE_RESULT = ('bad', 0, 0, 0, classify_angles(0, 0, 0))
+
+def create_pose_landmarker(model_path, delegate):
+    """Build a video-mode PoseLandmarker on the given delegate ("cpu" or "gpu")"""
+    base_options = mp.tasks.BaseOptions(
+        model_asset_path=model_path,
+        delegate=mp.tasks.BaseOptions.Delegate.GPU if delegate == "gpu" else mp.tasks.BaseOptions.Delegate.CPU
+    )
+    options = mp.tasks.vision.PoseLandmarkerOptions(
+        base_options=base_options,
+        running_mode=mp.tasks.vision.RunningMode.VIDEO,
+        num_poses=1,
+        min_pose_detection_confidence=0.7,
+        min_pose_presence_confidence=0.7,
+        min_tracking_confidence=0.7,
+        output_segmentation_masks=False
+    )
+    return mp.tasks.vision.PoseLandmarker.create_from_options(options)
+
+def create_cpu_pose_landmarker():
+    """CPU PoseLandmarker, using the quantized model when POSE_CPU_MODEL_PATH is set"""
+    model_path = POSE_CPU_MODEL_PATH or POSE_MODEL_PATH
+    logger.info(f"Running pose inference on CPU with {os.path.basename(model_path)}")
+    return create_pose_landmarker(model_path, "cpu")
+
 class PostureAnalyzer:
     def __init__(self):
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=2,
-            enable_segmentation=False,
-            smooth_landmarks=True,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+        for model_path in (POSE_MODEL_PATH, POSE_CPU_MODEL_PATH):
+            if model_path and not os.path.exists(model_path):
+                raise FileNotFoundError(
+                    f"Pose model not found at {model_path}. "
+                    "Download it as described under 'Pose Client Setup' in README.md"
+                )
         
-    def calculate_angle(self, point1, point2, point3):
-        """Calculate angle between three points (point2 is the vertex)"""
-        p1 = np.array([point1.x, point1.y, point1.z])
-        p2 = np.array([point2.x, point2.y, point2.z])
-        p3 = np.array([point3.x, point3.y, point3.z])
+        if POSE_DELEGATE == "cpu":
+            self.landmarker = create_cpu_pose_landmarker()
+        else:
+            try:
+                self.landmarker = create_pose_landmarker(POSE_MODEL_PATH, POSE_DELEGATE)
+            except RuntimeError as e:
+                logger.warning(f"{POSE_DELEGATE.upper()} delegate unavailable, falling back to CPU: {e}")
+                self.landmarker = create_cpu_pose_landmarker()
+        self._last_timestamp_ms = -1
         
-        v1 = p1 - p2
-        v2 = p3 - p2
+        # Landmark indices used by the posture metrics, resolved once
+        landmark = POSE_LANDMARK
+        self.mids = np.array([
+            [landmark.LEFT_SHOULDER.value, landmark.RIGHT_SHOULDER.value],
+            [landmark.LEFT_HIP.value, landmark.RIGHT_HIP.value],
+            # BETTER wrist angles use the average of index and pinky
+            [landmark.LEFT_INDEX.value, landmark.LEFT_PINKY.value],
+            [landmark.RIGHT_INDEX.value, landmark.RIGHT_PINKY.value],
+        ], dtype=np.int32)
         
-        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)
+        # Wrist angles (elbow, wrist, finger midpoint) for left and right
+        self.triples = np.array([
+            [landmark.LEFT_ELBOW.value, landmark.LEFT_WRIST.value, LEFT_FINGER_MID],
+            [landmark.RIGHT_ELBOW.value, landmark.RIGHT_WRIST.value, RIGHT_FINGER_MID],
+        ], dtype=np.int32)
         
-        angle = np.degrees(np.arccos(cos_angle))
-        return angle
+        # Neck (nose -> shoulder midpoint) and spine (shoulder midpoint -> hip midpoint)
+        self.pairs = np.array([
+            [landmark.NOSE.value, SHOULDER_MID],
+            [SHOULDER_MID, HIP_MID],
+        ], dtype=np.int32)
+        
+        # Persistent buffers reused every frame
+        self.pts = np.zeros((NUM_LANDMARKS + len(self.mids), 3), dtype=np.float32)
+        self.angles = np.zeros(len(self.triples) + len(self.pairs), dtype=np.float32)
+        
+        # Warm up the JIT kernel so compilation doesn't land on the first frame
+        compute_all_angles(self.pts, self.mids, self.triples, self.pairs, self.angles)
+        
+    def detect(self, rgb_frame):
+        """Run pose detection on an RGB frame; returns the first pose's landmarks or None"""
+        # Video mode requires strictly increasing timestamps
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        result = self.landmarker.detect_for_video(image, timestamp_ms)
+        return result.pose_landmarks[0] if result.pose_landmarks else None
     
-    def calculate_line_angle(self, point1, point2):
-        """Calculate angle of a line relative to vertical"""
-        dx = point2.x - point1.x
-        dy = point2.y - point1.y
-        angle = abs(np.degrees(np.arctan2(dx, dy)))
-        return angle
+    def close(self):
+        self.landmarker.close()
+    
+    def landmarks_to_array(self, landmarks):
+        """Pack all pose landmarks into a single (N, 3) float32 array"""
+        return np.fromiter(
+            (c for lm in landmarks for c in (lm.x, lm.y, lm.z)),
+            dtype=np.float32,
+            count=NUM_LANDMARKS * 3
+        ).reshape(NUM_LANDMARKS, 3)
     
     def analyze_posture(self, landmarks) -> tuple:
         """
         Medical-grade posture analysis
-        Returns: (status, wrist_angle, neck_angle, spine_angle)
+        Returns: (status, wrist_angle, neck_angle, spine_angle, status_codes)
         """
         if not landmarks:
-            return ('bad', 0, 0, 0)
+            return NO_POSE_RESULT
         
         try:
-            # Get landmarks
-            nose = landmarks[self.mp_pose.PoseLandmark.NOSE.value]
-            left_shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-            right_shoulder = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-            left_elbow = landmarks[self.mp_pose.PoseLandmark.LEFT_ELBOW.value]
-            right_elbow = landmarks[self.mp_pose.PoseLandmark.RIGHT_ELBOW.value]
-            left_wrist = landmarks[self.mp_pose.PoseLandmark.LEFT_WRIST.value]
-            right_wrist = landmarks[self.mp_pose.PoseLandmark.RIGHT_WRIST.value]
-            
-            # Try multiple finger points for better detection
-            left_index = landmarks[self.mp_pose.PoseLandmark.LEFT_INDEX.value]
-            right_index = landmarks[self.mp_pose.PoseLandmark.RIGHT_INDEX.value]
-            left_pinky = landmarks[self.mp_pose.PoseLandmark.LEFT_PINKY.value]
-            right_pinky = landmarks[self.mp_pose.PoseLandmark.RIGHT_PINKY.value]
-            
-            left_hip = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP.value]
-            right_hip = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP.value]
-            
-            # Calculate midpoints
-            class Point:
-                def __init__(self, x, y, z):
-                    self.x, self.y, self.z = x, y, z
-            
-            shoulder_midpoint = Point(
-                (left_shoulder.x + right_shoulder.x) / 2,
-                (left_shoulder.y + right_shoulder.y) / 2,
-                (left_shoulder.z + right_shoulder.z) / 2
-            )
-            
-            hip_midpoint = Point(
-                (left_hip.x + right_hip.x) / 2,
-                (left_hip.y + right_hip.y) / 2,
-                (left_hip.z + right_hip.z) / 2
-            )
-            
-            # Calculate BETTER wrist angles using average of index and pinky
-            # This gives more accurate wrist flexion measurement
-            left_finger_mid = Point(
-                (left_index.x + left_pinky.x) / 2,
-                (left_index.y + left_pinky.y) / 2,
-                (left_index.z + left_pinky.z) / 2
-            )
-            
-            right_finger_mid = Point(
-                (right_index.x + right_pinky.x) / 2,
-                (right_index.y + right_pinky.y) / 2,
-                (right_index.z + right_pinky.z) / 2
-            )
-            
-            # Calculate wrist angles with better finger point
-            left_wrist_angle = self.calculate_angle(left_elbow, left_wrist, left_finger_mid)
-            right_wrist_angle = self.calculate_angle(right_elbow, right_wrist, right_finger_mid)
-            wrist_angle = min(left_wrist_angle, right_wrist_angle)
+            self.pts[:NUM_LANDMARKS] = self.landmarks_to_array(landmarks)
+            angles = compute_all_angles(self.pts, self.mids, self.triples, self.pairs, self.angles)
             
-            neck_angle = self.calculate_line_angle(nose, shoulder_midpoint)
-            spine_angle = self.calculate_line_angle(shoulder_midpoint, hip_midpoint)
+            wrist_angle = float(min(angles[0], angles[1]))
+            neck_angle = float(angles[2])
+            spine_angle = float(angles[3])
             
-            # Classify posture
-            wrist_status = self.classify_wrist_posture(wrist_angle)
-            neck_status = self.classify_neck_posture(neck_angle)
-            spine_status = self.classify_spine_posture(spine_angle)
+            # Classify posture; overall status is the worst metric
+            codes = classify_angles(wrist_angle, neck_angle, spine_angle)
+            overall_status = STATUS_LABELS[codes.min()]
             
-            # Overall status
-            if wrist_status == 'bad' or neck_status == 'bad' or spine_status == 'bad':
-                overall_status = 'bad'
-            elif wrist_status == 'ok' or neck_status == 'ok' or spine_status == 'ok':
-                overall_status = 'ok'
-            else:
-                overall_status = 'good'
-            
-            return (overall_status, wrist_angle, neck_angle, spine_angle)
+            return (overall_status, wrist_angle, neck_angle, spine_angle, codes)
                 
         except Exception as e:
             logger.error(f"Posture analysis error: {e}")
-            return ('bad', 0, 0, 0)
+            return NO_POSE_RESULT
+
+# Drawing layout, grouped so each group is one cv2 call (or one call per point for circles)
+_L = POSE_LANDMARK
+# Alignment polylines: (landmark rows, BGR color, thickness)
+DRAW_LINES = (
+    # 1. NECK ALIGNMENT (Head to Shoulder) - Bright Cyan
+    (np.array([_L.NOSE.value, SHOULDER_MID]), (255, 255, 0), 3),
+    # 2. SPINE ALIGNMENT (Shoulder to Hip) - Bright Magenta
+    (np.array([SHOULDER_MID, HIP_MID]), (255, 0, 255), 3),
+    # 3. WRIST ANGLES - Thinner, cleaner lines: elbow -> wrist -> finger midpoint
+    # Left arm - Yellow
+    (np.array([_L.LEFT_ELBOW.value, _L.LEFT_WRIST.value, LEFT_FINGER_MID]), (0, 255, 255), 2),
+    # Right arm - Cyan
+    (np.array([_L.RIGHT_ELBOW.value, _L.RIGHT_WRIST.value, RIGHT_FINGER_MID]), (255, 200, 0), 2),
+)
+# Essential landmark dots: (landmark rows, radius, BGR color, thickness)
+DRAW_CIRCLES = (
+    # Head (neck alignment reference) - Cyan
+    (np.array([_L.NOSE.value]), 5, (255, 255, 0), -1),
+    # Shoulders (critical reference points) - Green
+    (np.array([_L.LEFT_SHOULDER.value, _L.RIGHT_SHOULDER.value, SHOULDER_MID]), 6, (0, 255, 0), -1),
+    # Elbows (wrist angle reference) - Blue
+    (np.array([_L.LEFT_ELBOW.value, _L.RIGHT_ELBOW.value]), 5, (255, 100, 0), -1),
+    # Wrists (wrist angle vertex) - Orange
+    (np.array([_L.LEFT_WRIST.value, _L.RIGHT_WRIST.value]), 6, (0, 165, 255), -1),
+    # Fingers (wrist angle endpoint) - Red with thin white border for visibility
+    (np.array([LEFT_FINGER_MID, RIGHT_FINGER_MID]), 8, (255, 255, 255), 1),
+    (np.array([LEFT_FINGER_MID, RIGHT_FINGER_MID]), 6, (0, 0, 255), -1),
+    # Hips (spine alignment reference) - Magenta
+    (np.array([_L.LEFT_HIP.value, _L.RIGHT_HIP.value, HIP_MID]), 6, (255, 0, 255), -1),
+)
+
+def draw_posture_landmarks(image, pts):
+    """
+    Draw ONLY essential landmarks for surgical training ergonomics
+    Clean, professional visualization - no clutter
+    pts: analyzer landmark buffer, including the midpoint rows
+    """
+    height, width, _ = image.shape
     
-    def classify_wrist_posture(self, angle):
-        """
-        Wrist angle classification - STRICTER MEDICAL STANDARDS
-        Good: 140°-180° (straight wrist, ideal)
-        OK: 110°-140° (mild flexion, acceptable short-term)
-        Bad: <110° (excessive flexion, injury risk)
-        """
-        if angle >= 140:  # Stricter threshold
-            return 'good'
-        elif angle >= 110:  # More realistic OK range
-            return 'ok'
-        else:
-            return 'bad'
+    # Pixel coordinates for every row in one NumPy op
+    pts2d = (pts[:, :2] * np.array([width, height], dtype=np.float32)).astype(np.int32)
     
-    def classify_neck_posture(self, angle):
-        """Neck alignment - VERY LENIENT"""
-        if angle <= 35:
-            return 'good'
-        elif angle <= 50:
-            return 'ok'
-        else:
-            return 'bad'
+    # === DRAW ALIGNMENT LINES (Posture metrics) ===
+    for rows, color, thickness in DRAW_LINES:
+        cv2.polylines(image, [pts2d[rows]], False, color, thickness)
     
-    def classify_spine_posture(self, angle):
-        """Spine alignment - EXTREMELY LENIENT"""
-        if 5 <= angle <= 80:
-            return 'good'
-        elif angle < 90:
-            return 'ok'
-        else:
-            return 'bad'
+    # === DRAW ESSENTIAL LANDMARKS ONLY ===
+    # Small, professional dots - not overwhelming
+    for rows, radius, color, thickness in DRAW_CIRCLES:
+        for point in pts2d[rows].tolist():
+            cv2.circle(image, tuple(point), radius, color, thickness)
+
+def draw_status_overlay(frame, posture_result, landmarks_detected):
+    """Draw posture status, angle readouts and camera setup tips"""
+    current_status, wrist_angle, neck_angle, spine_angle, status_codes = posture_result
     
-    def draw_posture_landmarks(self, image, landmarks):
-        """
-        Draw ONLY essential landmarks for surgical training ergonomics
-        Clean, professional visualization - no clutter
-        """
-        if not landmarks:
-            return
-        
-        height, width, _ = image.shape
-        
-        def get_point(landmark):
-            return (int(landmark.x * width), int(landmark.y * height))
-        
-        # Get ONLY essential landmarks for our 3 metrics
-        nose = landmarks[self.mp_pose.PoseLandmark.NOSE.value]
-        left_shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-        right_shoulder = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-        left_elbow = landmarks[self.mp_pose.PoseLandmark.LEFT_ELBOW.value]
-        right_elbow = landmarks[self.mp_pose.PoseLandmark.RIGHT_ELBOW.value]
-        left_wrist = landmarks[self.mp_pose.PoseLandmark.LEFT_WRIST.value]
-        right_wrist = landmarks[self.mp_pose.PoseLandmark.RIGHT_WRIST.value]
-        left_index = landmarks[self.mp_pose.PoseLandmark.LEFT_INDEX.value]
-        right_index = landmarks[self.mp_pose.PoseLandmark.RIGHT_INDEX.value]
-        left_pinky = landmarks[self.mp_pose.PoseLandmark.LEFT_PINKY.value]
-        right_pinky = landmarks[self.mp_pose.PoseLandmark.RIGHT_PINKY.value]
-        left_hip = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP.value]
-        right_hip = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP.value]
-        
-        # Calculate essential midpoints
-        nose_point = get_point(nose)
-        shoulder_mid = (int((left_shoulder.x + right_shoulder.x) / 2 * width),
-                       int((left_shoulder.y + right_shoulder.y) / 2 * height))
-        hip_mid = (int((left_hip.x + right_hip.x) / 2 * width),
-                   int((left_hip.y + right_hip.y) / 2 * height))
-        
-        # Finger midpoints for wrist angle
-        left_finger_mid = (int((left_index.x + left_pinky.x) / 2 * width),
-                          int((left_index.y + left_pinky.y) / 2 * height))
-        right_finger_mid = (int((right_index.x + right_pinky.x) / 2 * width),
-                           int((right_index.y + right_pinky.y) / 2 * height))
-        
-        # === DRAW ALIGNMENT LINES (Posture metrics) ===
-        
-        # 1. NECK ALIGNMENT (Head to Shoulder) - Bright Cyan
-        cv2.line(image, nose_point, shoulder_mid, (255, 255, 0), 3)
-        
-        # 2. SPINE ALIGNMENT (Shoulder to Hip) - Bright Magenta  
-        cv2.line(image, shoulder_mid, hip_mid, (255, 0, 255), 3)
-        
-        # 3. WRIST ANGLES - Thinner, cleaner lines
-        # Left arm - Yellow
-        cv2.line(image, get_point(left_elbow), get_point(left_wrist), (0, 255, 255), 2)
-        cv2.line(image, get_point(left_wrist), left_finger_mid, (0, 255, 255), 2)
-        
-        # Right arm - Cyan
-        cv2.line(image, get_point(right_elbow), get_point(right_wrist), (255, 200, 0), 2)
-        cv2.line(image, get_point(right_wrist), right_finger_mid, (255, 200, 0), 2)
-        
-        # === DRAW ESSENTIAL LANDMARKS ONLY ===
-        # Small, professional dots - not overwhelming
-        
-        # Head (neck alignment reference) - Cyan
-        cv2.circle(image, nose_point, 5, (255, 255, 0), -1)
-        
-        # Shoulders (critical reference points) - Green
-        cv2.circle(image, get_point(left_shoulder), 6, (0, 255, 0), -1)
-        cv2.circle(image, get_point(right_shoulder), 6, (0, 255, 0), -1)
-        cv2.circle(image, shoulder_mid, 6, (0, 255, 0), -1)
-        
-        # Elbows (wrist angle reference) - Blue
-        cv2.circle(image, get_point(left_elbow), 5, (255, 100, 0), -1)
-        cv2.circle(image, get_point(right_elbow), 5, (255, 100, 0), -1)
-        
-        # Wrists (wrist angle vertex) - Orange
-        cv2.circle(image, get_point(left_wrist), 6, (0, 165, 255), -1)
-        cv2.circle(image, get_point(right_wrist), 6, (0, 165, 255), -1)
-        
-        # Fingers (wrist angle endpoint) - Red with thin white border for visibility
-        cv2.circle(image, left_finger_mid, 8, (255, 255, 255), 1)   # White outline
-        cv2.circle(image, left_finger_mid, 6, (0, 0, 255), -1)      # Red center
-        cv2.circle(image, right_finger_mid, 8, (255, 255, 255), 1)
-        cv2.circle(image, right_finger_mid, 6, (0, 0, 255), -1)
-        
-        # Hips (spine alignment reference) - Magenta
-        cv2.circle(image, get_point(left_hip), 6, (255, 0, 255), -1)
-        cv2.circle(image, get_point(right_hip), 6, (255, 0, 255), -1)
-        cv2.circle(image, hip_mid, 6, (255, 0, 255), -1)
+    # Display status with colors
+    status_code = STATUS_LABELS.index(current_status)
+    status_color = STATUS_COLORS[status_code]
+    status_bg = STATUS_BG_COLORS[status_code]
+    
+    # Main status display
+    cv2.rectangle(frame, (5, 5), (400, 50), status_bg, -1)
+    cv2.putText(frame, f"POSTURE: {current_status.upper()}", 
+               (10, 35), cv2.FONT_HERSHEY_SIMPLEX, 1.2, status_color, 3)
+    
+    # Angle measurements
+    y_offset = 70
+    
+    # Wrist
+    wrist_color = STATUS_COLORS[status_codes[0]]
+    cv2.putText(frame, f"Wrist: {wrist_angle:.1f}°", 
+               (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.8, wrist_color, 2)
+    cv2.putText(frame, f"(Good: 140-180)", 
+               (250, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+    
+    # Head
+    neck_color = STATUS_COLORS[status_codes[1]]
+    cv2.putText(frame, f"Head: {neck_angle:.1f}°", 
+               (10, y_offset + 35), cv2.FONT_HERSHEY_SIMPLEX, 0.8, neck_color, 2)
+    cv2.putText(frame, f"(Good: 0-35)", 
+               (250, y_offset + 35), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+    
+    # Spine
+    spine_color = STATUS_COLORS[status_codes[2]]
+    cv2.putText(frame, f"Spine: {spine_angle:.1f}°", 
+               (10, y_offset + 70), cv2.FONT_HERSHEY_SIMPLEX, 0.8, spine_color, 2)
+    cv2.putText(frame, f"(Good: 5-80)", 
+               (250, y_offset + 70), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+    
+    # Landmarks detected indicator
+    cv2.putText(frame, f"Landmarks: {'DETECTED' if landmarks_detected else 'NOT FOUND'}", 
+               (10, y_offset + 110), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 
+               (0, 255, 0) if landmarks_detected else (0, 0, 255), 2)
+    
+    # Instructions
+    instruction_y = frame.shape[0] - 120
+    cv2.rectangle(frame, (5, instruction_y), (650, frame.shape[0] - 5), (40, 40, 40), -1)
+    
+    cv2.putText(frame, "CAMERA SETUP TIPS:", 
+               (15, instruction_y + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+    cv2.putText(frame, "1. Sit 3-4 feet from camera", 
+               (15, instruction_y + 50), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+    cv2.putText(frame, "2. Turn chair 45° LEFT (camera sees your right side)", 
+               (15, instruction_y + 70), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+    cv2.putText(frame, "3. Show HIP to HEAD in frame", 
+               (15, instruction_y + 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+    cv2.putText(frame, "4. RED dots (with white border) = Finger tips!", 
+               (15, instruction_y + 110), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+    
+    cv2.putText(frame, "Posture lines: YELLOW=Head->Shoulder | MAGENTA=Shoulder->Hip", 
+               (10, instruction_y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+    cv2.putText(frame, "Wrist angles: CYAN=Left arm | YELLOW=Right arm -> Finger midpoint", 
+               (10, instruction_y - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+
+def display_loop(frame_queue, stop_event):
+    """Render frames in a separate process so GUI work never blocks capture/inference"""
+    try:
+        while not stop_event.is_set():
+            try:
+                item = frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            
+            frame, pts, posture_result = item
+            if pts is not None:
+                draw_posture_landmarks(frame, pts)
+            draw_status_overlay(frame, posture_result, pts is not None)
+            
+            cv2.imshow('PostureTrack', frame)
+            
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                stop_event.set()
+    finally:
+        cv2.destroyAllWindows()
 
 class PostureClient:
-    def __init__(self, backend_url="ws://localhost:8000/ws/posture"):
+    def __init__(self, backend_url="ws://localhost:8000/ws/posture", display: bool = True):
         self.backend_url = backend_url
+        self.display = display
         self.analyzer = PostureAnalyzer()
         self.websocket = None
         self.cap = None
+        self._send_queue = None
+        self._sender_task = None
+        self._receiver_task = None
+        # Single worker: the MediaPipe graph must not run concurrently
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Reused BGR->RGB destination, sized from the first inference frame
+        self._rgb_buf = None
+        # Rendering runs in its own process; frames are dropped when it falls behind
+        self._display_process = None
+        self._frame_queue = None
+        self._stop_event = None
         
     async def connect_to_backend(self):
         """Connect to backend WebSocket"""
         try:
             self.websocket = await websockets.connect(self.backend_url)
             logger.info(f"Connected to backend at {self.backend_url}")
-            return True
         except Exception as e:
             logger.error(f"Failed to connect to backend: {e}")
             return False
+        
+        # Sends and server replies run as their own tasks so capture never waits on the socket
+        self._send_queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._sender_task = asyncio.create_task(self._sender())
+        self._receiver_task = asyncio.create_task(self._receiver())
+        return True
+    
+    async def disconnect(self):
+        """Flush pending updates, then close the backend WebSocket"""
+        if not self.websocket:
+            return
+        
+        try:
+            await asyncio.wait_for(self._send_queue.join(), timeout=1.0)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out flushing posture updates")
+        self._sender_task.cancel()
+        self._receiver_task.cancel()
+        await self.websocket.close()
+    
+    def queue_posture_data(self, status: str):
+        """Queue posture data for the sender task; drops the update if the queue is full"""
+        data = {
+            "status": status,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        }
+        try:
+            self._send_queue.put_nowait(data)
+        except asyncio.QueueFull:
+            logger.warning("Send queue full, dropping posture update")
     
-    async def send_posture_data(self, status: str):
+    async def send_posture_data(self, data: dict):
         """Send posture data to backend"""
         if not self.websocket:
             return False
         
         try:
-            data = {
-                "status": status,
-                "timestamp": datetime.utcnow().isoformat() + "Z"
-            }
-            await self.websocket.send(json.dumps(data))
-            
-            response = await asyncio.wait_for(self.websocket.recv(), timeout=1.0)
-            logger.info(f"Backend response: {response}")
+            # orjson bytes go out as a binary frame
+            await self.websocket.send(orjson.dumps(data))
             return True
         except Exception as e:
             logger.error(f"Failed to send data to backend: {e}")
             return False
     
+    async def _sender(self):
+        while True:
+            data = await self._send_queue.get()
+            try:
+                await self.send_posture_data(data)
+            finally:
+                self._send_queue.task_done()
+    
+    async def _receiver(self):
+        """Drain server messages (only sent on errors) without blocking sends"""
+        try:
+            async for message in self.websocket:
+                logger.warning(f"Backend response: {message}")
+        except websockets.ConnectionClosed:
+            logger.info("Backend connection closed")
+    
     async def start_camera_capture(self):
         """Start camera capture and posture analysis"""
         self.cap = cv2.VideoCapture(0)
@@ -295,143 +467,120 @@ class PostureClient:
             logger.error("Failed to open camera")
             return
         
-        logger.info("Camera started. Press 'q' to quit.")
+        # Keep only the newest frame; posture changes slowly so 15 FPS is plenty
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.cap.set(cv2.CAP_PROP_FPS, CAPTURE_FPS)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, INFER_WIDTH)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, INFER_HEIGHT)
+        
+        if self.display:
+            self.start_display()
+            logger.info("Camera started. Press 'q' to quit.")
+        else:
+            logger.info("Camera started in headless mode. Press Ctrl+C to quit.")
         last_status = None
+        last_heartbeat = 0.0
         frame_count = 0
+        pose_detected = False
+        posture_result = NO_POSE_RESULT
+        loop = asyncio.get_running_loop()
         
         try:
-            while True:
-                ret, frame = self.cap.read()
+            while not (self._stop_event and self._stop_event.is_set()):
+                # Read on the worker thread too: it blocks until the next frame, and every
+                # iteration must yield so the sender/receiver tasks run between inferences
+                ret, frame = await loop.run_in_executor(self._pool, self.cap.read)
                 if not ret:
                     logger.error("Failed to capture frame")
                     break
                 
-                frame = cv2.flip(frame, 1)
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = self.analyzer.pose.process(rgb_frame)
-                
-                # Analyze posture - FIX: Extract values from tuple
-                posture_result = ('bad', 0, 0, 0)
-                wrist_angle = 0
-                neck_angle = 0
-                spine_angle = 0
+                cv2.flip(frame, 1, dst=frame)
                 
-                if results.pose_landmarks:
-                    posture_result = self.analyzer.analyze_posture(results.pose_landmarks.landmark)
-                    current_status = posture_result[0]  # Extract just the status string
-                    wrist_angle = posture_result[1]
-                    neck_angle = posture_result[2]
-                    spine_angle = posture_result[3]
+                # Intervening frames reuse the last inference result
+                if frame_count % INFER_EVERY == 0:
+                    # Cameras that ignore the requested size get downscaled here;
+                    # landmarks are normalized so drawing on the full frame still lines up
+                    infer_frame = frame
+                    if frame.shape[1] > INFER_WIDTH:
+                        infer_size = (INFER_WIDTH, round(frame.shape[0] * INFER_WIDTH / frame.shape[1]))
+                        infer_frame = cv2.resize(frame, infer_size, interpolation=cv2.INTER_AREA)
+                    if self._rgb_buf is None or self._rgb_buf.shape != infer_frame.shape:
+                        self._rgb_buf = np.empty_like(infer_frame)
+                    cv2.cvtColor(infer_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+                    # Run inference off the event loop so WebSocket I/O keeps flowing
+                    landmarks = await loop.run_in_executor(self._pool, self.analyzer.detect, self._rgb_buf)
                     
-                    # Draw custom landmarks
-                    self.analyzer.draw_posture_landmarks(frame, results.pose_landmarks.landmark)
-                else:
-                    current_status = 'bad'
-                
-                # Display status with colors
-                if current_status == 'good':
-                    status_color = (0, 255, 0)
-                    status_bg = (0, 100, 0)
-                elif current_status == 'ok':
-                    status_color = (0, 255, 255)
-                    status_bg = (0, 100, 100)
-                else:
-                    status_color = (0, 0, 255)
-                    status_bg = (0, 0, 100)
-                
-                # Main status display
-                cv2.rectangle(frame, (5, 5), (400, 50), status_bg, -1)
-                cv2.putText(frame, f"POSTURE: {current_status.upper()}", 
-                           (10, 35), cv2.FONT_HERSHEY_SIMPLEX, 1.2, status_color, 3)
-                
-                # Angle measurements
-                y_offset = 70
-                
-                # Wrist
-                wrist_color = (0, 255, 0) if wrist_angle >= 140 else (0, 255, 255) if wrist_angle >= 110 else (0, 0, 255)
-                cv2.putText(frame, f"Wrist: {wrist_angle:.1f}°", 
-                           (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.8, wrist_color, 2)
-                cv2.putText(frame, f"(Good: 140-180)", 
-                           (250, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-                
-                # Head
-                neck_color = (0, 255, 0) if neck_angle <= 35 else (0, 255, 255) if neck_angle <= 50 else (0, 0, 255)
-                cv2.putText(frame, f"Head: {neck_angle:.1f}°", 
-                           (10, y_offset + 35), cv2.FONT_HERSHEY_SIMPLEX, 0.8, neck_color, 2)
-                cv2.putText(frame, f"(Good: 0-35)", 
-                           (250, y_offset + 35), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-                
-                # Spine
-                spine_color = (0, 255, 0) if 5 <= spine_angle <= 80 else (0, 255, 255) if spine_angle < 90 else (0, 0, 255)
-                cv2.putText(frame, f"Spine: {spine_angle:.1f}°", 
-                           (10, y_offset + 70), cv2.FONT_HERSHEY_SIMPLEX, 0.8, spine_color, 2)
-                cv2.putText(frame, f"(Good: 5-80)", 
-                           (250, y_offset + 70), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-                
-                # Landmarks detected indicator
-                cv2.putText(frame, f"Landmarks: {'DETECTED' if results.pose_landmarks else 'NOT FOUND'}", 
-                           (10, y_offset + 110), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 
-                           (0, 255, 0) if results.pose_landmarks else (0, 0, 255), 2)
+                    # Analyze posture
+                    pose_detected = landmarks is not None
+                    posture_result = NO_POSE_RESULT
+                    if pose_detected:
+                        posture_result = self.analyzer.analyze_posture(landmarks)
+                current_status = posture_result[0]
                 
-                # Instructions
-                instruction_y = frame.shape[0] - 120
-                cv2.rectangle(frame, (5, instruction_y), (650, frame.shape[0] - 5), (40, 40, 40), -1)
-                
-                cv2.putText(frame, "CAMERA SETUP TIPS:", 
-                           (15, instruction_y + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-                cv2.putText(frame, "1. Sit 3-4 feet from camera", 
-                           (15, instruction_y + 50), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-                cv2.putText(frame, "2. Turn chair 45° LEFT (camera sees your right side)", 
-                           (15, instruction_y + 70), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-                cv2.putText(frame, "3. Show HIP to HEAD in frame", 
-                           (15, instruction_y + 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-                cv2.putText(frame, "4. RED dots (with white border) = Finger tips!", 
-                           (15, instruction_y + 110), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-                
-                cv2.putText(frame, "Posture lines: YELLOW=Head->Shoulder | MAGENTA=Shoulder->Hip", 
-                           (10, instruction_y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv2.putText(frame, "Wrist angles: CYAN=Left arm | YELLOW=Right arm -> Finger midpoint", 
-                           (10, instruction_y - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-                
-                # Send data every 30 frames or when status changes
+                # Send data when status changes, plus a periodic heartbeat
                 frame_count += 1
-                if (frame_count % 30 == 0 or current_status != last_status) and self.websocket:
-                    await self.send_posture_data(current_status)  # Send only the status string
+                now = time.monotonic()
+                if (current_status != last_status or now - last_heartbeat > HEARTBEAT_INTERVAL) and self.websocket:
+                    self.queue_posture_data(current_status)  # Send only the status string
                     last_status = current_status
+                    last_heartbeat = now
                 
-                cv2.imshow('PostureTrack', frame)
-                
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-                
-                await asyncio.sleep(0.033)
+                if self.display:
+                    # Copy the landmark buffer: the analyzer reuses it next frame
+                    pts = self.analyzer.pts.copy() if pose_detected else None
+                    try:
+                        self._frame_queue.put_nowait((frame, pts, posture_result))
+                    except queue.Full:
+                        pass
                 
         except KeyboardInterrupt:
             logger.info("Stopping camera capture...")
         finally:
             self.cleanup()
     
+    def start_display(self):
+        """Spawn the display process fed by a small bounded frame queue"""
+        ctx = multiprocessing.get_context("spawn")
+        self._frame_queue = ctx.Queue(maxsize=2)
+        self._stop_event = ctx.Event()
+        self._display_process = ctx.Process(
+            target=display_loop, args=(self._frame_queue, self._stop_event), daemon=True
+        )
+        self._display_process.start()
+    
     def cleanup(self):
         """Clean up resources"""
         if self.cap:
             self.cap.release()
-        cv2.destroyAllWindows()
+        self._pool.shutdown(wait=True)
+        self.analyzer.close()
+        if self._display_process:
+            self._stop_event.set()
+            self._display_process.join(timeout=2)
+            self._frame_queue.cancel_join_thread()
         logger.info("Camera resources cleaned up")
 
-async def main():
-    client = PostureClient()
+async def main(display: bool = True):
+    try:
+        client = PostureClient(display=display)
+    except FileNotFoundError as e:
+        logger.error(e)
+        return
     
     if not await client.connect_to_backend():
         logger.error("Could not connect to backend. Make sure FastAPI server is running.")
         return
     
     await client.start_camera_capture()
-    
-    if client.websocket:
-        await client.websocket.close()
+    await client.disconnect()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PostureTrack pose client")
+    parser.add_argument("--display", action=argparse.BooleanOptionalAction, default=True,
+                        help="show the annotated camera window (--no-display for headless runs)")
+    args = parser.parse_args()
+    
     try:
-        asyncio.run(main())
+        asyncio.run(main(display=args.display))
     except KeyboardInterrupt:
         logger.info("Application stopped by user")
\ No newline at end of file